@@ -0,0 +1,209 @@
+import asyncio
+from functools import lru_cache
+from hashlib import md5
+from math import sqrt
+from time import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.model.message import Message
+from phi.model.response import ModelResponse
+from phi.utils.log import logger
+from phi.vectordb.base import VectorDb
+from pydantic import PrivateAttr
+
+from agents.model import ParallelToolOpenAIChat
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    norm = sqrt(sum(x * x for x in a)) * sqrt(sum(y * y for y in b))
+    if norm == 0:
+        return 0.0
+    return sum(x * y for x, y in zip(a, b)) / norm
+
+
+class MemoEmbedder(Embedder):
+    """Embedder that remembers its most recent embeddings.
+
+    A cache lookup embeds the prompt for the vector search and again for the similarity check,
+    and a cache write embeds it a third time. With this embedder the API is only called once.
+    """
+
+    embedder: Embedder
+    maxsize: int = 64
+
+    _get_embedding: Callable[[str], List[float]] = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self.dimensions = self.embedder.dimensions
+        self._get_embedding = lru_cache(maxsize=self.maxsize)(self.embedder.get_embedding)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self._get_embedding(text)
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self._get_embedding(text), None
+
+
+class CacheKey(NamedTuple):
+    prompt: str
+    # Hash of the user or session and the recent history, cached answers are only shared within it
+    scope: str
+
+
+class CachedOpenAIChat(ParallelToolOpenAIChat):
+    """OpenAIChat that answers repeated prompts from a semantic cache.
+
+    The latest user message is looked up in `cache`. If the closest cached prompt has a cosine
+    similarity of at least `similarity_threshold` and is younger than `ttl_seconds`, its stored
+    answer is returned without calling the OpenAI API. Answers to cache misses are written back to
+    `cache`, unless the model called tools to produce them.
+
+    Entries are scoped to the user (or session) and the recent conversation, so an answer is never
+    returned to another user or for a follow-up in a different conversation. Short prompts like
+    "yes" or "continue" depend on the conversation and are never cached.
+    Any phi VectorDb can be used as the cache, give it a MemoEmbedder so each prompt is embedded once.
+    """
+
+    cache: Optional[VectorDb] = None
+    similarity_threshold: float = 0.92
+    ttl_seconds: int = 3600
+    min_prompt_words: int = 4
+    # Number of earlier user/assistant messages included in the cache scope
+    history_messages: int = 4
+    user_id: Optional[str] = None
+
+    def get_cache_key(self, messages: List[Message]) -> Optional[CacheKey]:
+        # Only plain-text user turns are cached, tool results and images always go to the model
+        if self.cache is None or len(messages) == 0:
+            return None
+        owner = self.user_id or self.session_id
+        if owner is None:
+            return None
+        last_message = messages[-1]
+        if last_message.role != "user" or not isinstance(last_message.content, str):
+            return None
+        if len(last_message.content.split()) < self.min_prompt_words:
+            return None
+
+        history = [m for m in messages[:-1] if m.role in ("user", "assistant") and isinstance(m.content, str)]
+        recent = history[-self.history_messages :] if self.history_messages > 0 else []
+        scope = md5(owner.encode())
+        for message in recent:
+            scope.update(f"\0{message.role}\0{message.content}".encode())
+        return CacheKey(prompt=last_message.content, scope=scope.hexdigest())
+
+    def get_cached_response(self, key: CacheKey) -> Optional[str]:
+        if self.cache is None:
+            return None
+        try:
+            documents = self.cache.search(query=key.prompt, limit=1, filters={"scope": key.scope})
+            if len(documents) == 0:
+                return None
+            document = documents[0]
+            cached_response = document.meta_data.get("response")
+            if cached_response is None or document.embedding is None or document.embedder is None:
+                return None
+            if time() - document.meta_data.get("created_at", 0) > self.ttl_seconds:
+                return None
+            similarity = cosine_similarity(document.embedder.get_embedding(key.prompt), document.embedding)
+            if similarity < self.similarity_threshold:
+                return None
+            logger.debug(f"Response cache hit (similarity: {similarity:.3f})")
+            return cached_response
+        except Exception as e:
+            logger.warning(f"Could not read from response cache: {e}")
+            return None
+
+    def add_cached_response(self, key: CacheKey, response: str) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.upsert(
+                documents=[
+                    Document(
+                        id=md5(f"{key.scope}\0{key.prompt}".encode()).hexdigest(),
+                        content=key.prompt,
+                        meta_data={"response": response, "created_at": time()},
+                    )
+                ],
+                filters={"scope": key.scope},
+            )
+        except Exception as e:
+            logger.warning(f"Could not write to response cache: {e}")
+
+    def _cache_hit(self, messages: List[Message], cached_response: str) -> ModelResponse:
+        # Add the cached answer to the messages so it is stored in the agent memory like a model response
+        messages.append(Message(role="assistant", content=cached_response))
+        return ModelResponse(content=cached_response)
+
+    @staticmethod
+    def _used_tools(messages: List[Message], start: int) -> bool:
+        # Tool results can go stale (prices, news), so answers built on them are not cached
+        return any(m.role == "tool" for m in messages[start:])
+
+    def response(self, messages: List[Message]) -> ModelResponse:
+        key = self.get_cache_key(messages)
+        if key is not None:
+            cached_response = self.get_cached_response(key)
+            if cached_response is not None:
+                return self._cache_hit(messages, cached_response)
+
+        start = len(messages)
+        model_response = super().response(messages=messages)
+        if key is not None and model_response.content and not self._used_tools(messages, start):
+            self.add_cached_response(key, model_response.content)
+        return model_response
+
+    async def aresponse(self, messages: List[Message]) -> ModelResponse:
+        # The cache does blocking DB and embedding calls, keep them off the event loop
+        key = self.get_cache_key(messages)
+        if key is not None:
+            cached_response = await asyncio.to_thread(self.get_cached_response, key)
+            if cached_response is not None:
+                return self._cache_hit(messages, cached_response)
+
+        start = len(messages)
+        model_response = await super().aresponse(messages=messages)
+        if key is not None and model_response.content and not self._used_tools(messages, start):
+            await asyncio.to_thread(self.add_cached_response, key, model_response.content)
+        return model_response
+
+    def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
+        key = self.get_cache_key(messages)
+        if key is not None:
+            cached_response = self.get_cached_response(key)
+            if cached_response is not None:
+                yield self._cache_hit(messages, cached_response)
+                return
+
+        start = len(messages)
+        response_content = ""
+        for model_response in super().response_stream(messages=messages):
+            if model_response.content is not None:
+                response_content += model_response.content
+            yield model_response
+        if key is not None and response_content and not self._used_tools(messages, start):
+            self.add_cached_response(key, response_content)
+
+    # phi declares this as a coroutine returning Any but consumes it (and OpenAIChat implements it)
+    # as an async generator, so mypy sees a signature mismatch that doesn't exist at runtime
+    async def aresponse_stream(  # type: ignore[override]
+        self, messages: List[Message]
+    ) -> AsyncIterator[ModelResponse]:
+        key = self.get_cache_key(messages)
+        if key is not None:
+            cached_response = await asyncio.to_thread(self.get_cached_response, key)
+            if cached_response is not None:
+                yield self._cache_hit(messages, cached_response)
+                return
+
+        start = len(messages)
+        response_content = ""
+        async for model_response in super().aresponse_stream(messages=messages):
+            if model_response.content is not None:
+                response_content += model_response.content
+            yield model_response
+        if key is not None and response_content and not self._used_tools(messages, start):
+            await asyncio.to_thread(self.add_cached_response, key, response_content)
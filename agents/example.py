@@ -1,12 +1,18 @@
-from typing import Optional
-from phi.agent import Agent
+import asyncio
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Tuple
+from phi.agent import Agent, RunResponse
+from phi.embedder.openai import OpenAIEmbedder
 from phi.model.openai import OpenAIChat
 from phi.knowledge.agent import AgentKnowledge
+from phi.memory.summarizer import MemorySummarizer
 from phi.storage.agent.postgres import PgAgentStorage
+from phi.tools import Toolkit
 from phi.tools.duckduckgo import DuckDuckGo
 from phi.tools.webscraper import WebScraper
 from phi.tools.calculator import Calculator
-from phi.tools.python_repl import PythonREPL
 from phi.tools.file_manager import FileManager
 from phi.tools.yfinance import YFinanceTools
 from phi.tools.newspaper import Newspaper4k
@@ -25,59 +31,290 @@ from phi.tools.xml import XmlTools
 from phi.tools.csv import CsvTools
 from phi.tools.api import ApiTools
 from phi.vectordb.pgvector import PgVector, SearchType
-from datetime import datetime
+from datetime import date
 
+from agents.cache import CachedOpenAIChat, MemoEmbedder
+from agents.knowledge import HalfVecPgVector, configure_hnsw_params
+from agents.memory import SummarizingMemory
 from agents.settings import agent_settings
-from db.session import db_url
+from agents.team import LazyAgent, TeamLeaderAgent
+from agents.tools import OutputPagerTools, PooledPythonTools
+from db.session import db_engine
 
 # Storage setup with both PgVector and Qdrant
-example_agent_storage = PgAgentStorage(table_name="example_agent_sessions", db_url=db_url)
+example_agent_storage = PgAgentStorage(table_name="example_agent_sessions", db_engine=db_engine)
 example_agent_knowledge = AgentKnowledge(
-    vector_db=PgVector(
-        table_name="example_agent_knowledge", 
-        db_url=db_url, 
-        search_type=SearchType.hybrid
+    vector_db=HalfVecPgVector(
+        table_name="example_agent_knowledge",
+        db_engine=db_engine,
+        search_type=SearchType.hybrid,
+        vector_index=configure_hnsw_params(agent_settings.knowledge_vector_count),
     )
 )
+# Semantic cache of super agent responses, kept apart from the knowledge base
+example_agent_response_cache = PgVector(
+    table_name="example_agent_response_cache",
+    db_engine=db_engine,
+    embedder=MemoEmbedder(embedder=OpenAIEmbedder()),
+)
+
+# -*- Toolkits shared by every agent built in this module
+# These are stateless adapters, so a single instance is reused instead of being rebuilt on every call.
+# ExaTools is shared per day below.
+# Document readers return whole documents, so their outputs are paged through _output_pager.
+_output_pager = OutputPagerTools()
+_duckduckgo = DuckDuckGo()
+_web_scraper = _output_pager.wrap(WebScraper())
+_calculator = Calculator()
+_file_manager = FileManager()
+_yfinance = YFinanceTools(enable_all=True)
+_newspaper = _output_pager.wrap(Newspaper4k())
+_youtube = YouTubeTools()
+_pdf = _output_pager.wrap(PDFTools())
+_email = EmailTools()
+_sql = SQLTools()
+_datetime = DatetimeTools()
+_image = ImageTools()
+_chart = ChartTools()
+_table = TableTools()
+_text = TextTools()
+_json = JsonTools()
+_xml = XmlTools()
+_csv = CsvTools()
+_api = ApiTools()
+_python = PooledPythonTools()
+
+
+@lru_cache(maxsize=2)
+def _exa_tools(day: str) -> ExaTools:
+    """ExaTools for articles published since `day`, shared by every call made on that day"""
+    return ExaTools(start_published_date=day)
+
+
+def _sorted_tools(tools: List[Toolkit]) -> List[Toolkit]:
+    """Order toolkits by class name so the tool schemas sent to the model are identical across calls"""
+    return sorted(tools, key=lambda tool: type(tool).__name__)
+
+
+# -*- Agent descriptions
+_FINANCE_DESCRIPTION = sys.intern("You are a senior investment analyst specializing in market research, financial analysis, and quantitative modeling.")
+_RESEARCH_DESCRIPTION = sys.intern("You are a senior research analyst specializing in market intelligence, trend analysis, and competitive research.")
+_PRODUCTIVITY_DESCRIPTION = sys.intern("You are a productivity expert specializing in task automation, workflow optimization, and information management.")
+_SUPER_AGENT_DESCRIPTION = sys.intern(
+    """You are AIGI3, an advanced AI agent team coordinator specializing in finance, research, and productivity.
+        You orchestrate a team of specialized agents and have access to comprehensive market data, research tools, and automation capabilities.
+        Your role is to ensure seamless collaboration between agents and deliver high-quality, integrated solutions."""
+)
+
+# -*- Agent instructions
+# Kept as interned module-level constants so every agent sends a byte-identical prompt prefix.
+_FINANCE_INSTRUCTIONS: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Financial Analysis Protocol:\n"
+    "  - Conduct thorough market analysis using YFinance\n"
+    "  - Provide quantitative insights with statistical backing\n"
+    "  - Generate detailed technical analysis with clear explanations\n"
+    "  - Process financial reports and SEC filings\n"
+    "  - Perform SQL-based financial data analysis",
+
+    "Data Presentation:\n"
+    "  - Always use tables for numerical data\n"
+    "  - Include relevant market indicators\n"
+    "  - Cite sources and timestamps for market data\n"
+    "  - Generate visualizations when appropriate",
+
+    "Team Collaboration:\n"
+    "  - Share market insights with Research Analyst\n"
+    "  - Coordinate with Productivity Assistant for automation\n"
+    "  - Maintain structured documentation for the team",
+)))
+
+_RESEARCH_INSTRUCTIONS: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Research Protocol:\n"
+    "  - Conduct comprehensive web research\n"
+    "  - Analyze news articles and reports\n"
+    "  - Synthesize information from multiple sources\n"
+    "  - Track temporal trends and patterns\n"
+    "  - Monitor competitor activities",
+
+    "Report Format:\n"
+    "  - Structure as NYT-style articles\n"
+    "  - Include executive summary\n"
+    "  - Provide detailed citations\n"
+    "  - Add timestamps for time-sensitive data",
+
+    "Team Collaboration:\n"
+    "  - Share research findings with Finance Analyst\n"
+    "  - Coordinate with Productivity Assistant for report automation\n"
+    "  - Maintain research database for the team",
+)))
+
+_PRODUCTIVITY_INSTRUCTIONS: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Task Automation:\n"
+    "  - Write Python scripts for repetitive tasks\n"
+    "  - Process and analyze documents efficiently\n"
+    "  - Automate data collection and reporting\n"
+    "  - Create SQL queries for data analysis\n"
+    "  - Manage email communications",
+
+    "Document Management:\n"
+    "  - Extract key information from documents\n"
+    "  - Organize and categorize content\n"
+    "  - Generate structured summaries\n"
+    "  - Maintain version control",
+
+    "Information Processing:\n"
+    "  - Synthesize data from multiple sources\n"
+    "  - Create actionable insights\n"
+    "  - Maintain clear documentation\n"
+    "  - Schedule and track deadlines",
+
+    "Team Collaboration:\n"
+    "  - Automate workflows for Finance and Research teams\n"
+    "  - Create templates and documentation\n"
+    "  - Maintain shared knowledge base",
+)))
+
+_SUPER_AGENT_INSTRUCTIONS: Tuple[str, ...] = tuple(map(sys.intern, (
+    "Team Coordination:\n"
+    "  - Analyze requests and delegate tasks to appropriate specialized agents\n"
+    "  - Ensure effective communication between agents\n"
+    "  - Synthesize insights from multiple agents into cohesive outputs\n"
+    "  - Monitor and maintain quality standards across all deliverables",
+
+    "Financial Analysis:\n"
+    "  - Coordinate Finance Analyst's market research with Research Analyst's findings\n"
+    "  - Ensure comprehensive coverage of both technical and fundamental analysis\n"
+    "  - Validate financial data accuracy across team outputs",
+
+    "Research Integration:\n"
+    "  - Combine market intelligence with financial analysis\n"
+    "  - Ensure cross-validation of sources and findings\n"
+    "  - Maintain consistent research standards across the team",
+
+    "Knowledge Management:\n"
+    "  - Coordinate knowledge sharing between agents\n"
+    "  - Ensure proper documentation of all analyses and findings\n"
+    "  - Maintain version control of shared resources",
+
+    "Productivity Enhancement:\n"
+    "  - Identify opportunities for workflow automation\n"
+    "  - Streamline collaboration between agents\n"
+    "  - Optimize resource utilization across the team",
+
+    "Quality Control:\n"
+    "  - Review and validate all agent outputs\n"
+    "  - Ensure consistency in formatting and presentation\n"
+    "  - Maintain audit trails for all team activities",
+)))
+
+
+# -*- Super agent settings
+# Read-only views over literals built once at import time, shared by every super agent.
+_MONITORING_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "metrics": {
+        "custom_metrics": {
+            "team_coordination_latency": {
+                "type": "Histogram",
+                "description": "Time taken for team coordination tasks",
+                "buckets": (0.1, 0.5, 1.0, 2.0, 5.0)
+            },
+            "agent_memory_usage": {
+                "type": "Gauge",
+                "description": "Memory usage per agent"
+            },
+            "knowledge_base_hits": {
+                "type": "Counter",
+                "description": "Knowledge base access patterns"
+            }
+        }
+    },
+    "tracing": {
+        "enabled": True,
+        "sample_rate": 1.0
+    }
+})
+
+_COORDINATION_PATTERNS: Mapping[str, Any] = MappingProxyType({
+    "consensus": {
+        "min_agreements": 2,
+        "timeout": 30
+    },
+    "fallback": {
+        "retry_count": 3,
+        "backup_agent": "productivity-agent"
+    }
+})
+
+_ERROR_MESSAGES: Mapping[str, str] = MappingProxyType({
+    "rate_limit": "Please wait a moment before sending another message.",
+    "token_limit": "The message is too long. Please try a shorter message.",
+    "api_error": "There was a temporary issue. Please try again."
+})
+
+_ERROR_HANDLING: Mapping[str, Any] = MappingProxyType({
+    "ui_friendly_errors": True,
+    "retry_on_failure": True,
+    "max_retries": 3,
+    "error_messages": _ERROR_MESSAGES
+})
+
+
+def _finance_tools() -> List[Toolkit]:
+    return _sorted_tools([
+        _yfinance,
+        _calculator,
+        _duckduckgo,
+        _pdf,  # For financial reports
+        _sql,  # For data analysis
+        _chart,  # For technical analysis charts
+        _table,  # For financial data tables
+        _json,   # For API responses
+        _api,    # For external financial APIs
+        _output_pager,
+    ])
+
+
+def _research_tools() -> List[Toolkit]:
+    return _sorted_tools([
+        _duckduckgo,
+        _newspaper,
+        _exa_tools(date.today().isoformat()),
+        _pdf,
+        _web_scraper,
+        _datetime,
+        _text,    # For text analysis
+        _image,   # For image processing
+        _xml,     # For structured data
+        _csv,     # For data processing
+        _output_pager,
+    ])
+
+
+def _productivity_tools() -> List[Toolkit]:
+    return _sorted_tools([
+        _python,
+        _file_manager,
+        _calculator,
+        _youtube,
+        _web_scraper,
+        _email,
+        _pdf,
+        _sql,
+        _datetime,
+        _output_pager,
+    ])
+
 
 def get_finance_agent() -> Agent:
     return Agent(
         name="Finance Analyst",
         agent_id="finance-analyst",
         model=OpenAIChat(id=agent_settings.gpt_4),
-        tools=[
-            YFinanceTools(enable_all=True),
-            Calculator(),
-            DuckDuckGo(),
-            PDFTools(),  # For financial reports
-            SQLTools(),  # For data analysis
-            ChartTools(),  # For technical analysis charts
-            TableTools(),  # For financial data tables
-            JsonTools(),   # For API responses
-            ApiTools(),    # For external financial APIs
-        ],
-        description="You are a senior investment analyst specializing in market research, financial analysis, and quantitative modeling.",
-        instructions=[
-            "Financial Analysis Protocol:\n"
-            "  - Conduct thorough market analysis using YFinance\n"
-            "  - Provide quantitative insights with statistical backing\n"
-            "  - Generate detailed technical analysis with clear explanations\n"
-            "  - Process financial reports and SEC filings\n"
-            "  - Perform SQL-based financial data analysis",
-            
-            "Data Presentation:\n"
-            "  - Always use tables for numerical data\n"
-            "  - Include relevant market indicators\n"
-            "  - Cite sources and timestamps for market data\n"
-            "  - Generate visualizations when appropriate",
-            
-            "Team Collaboration:\n"
-            "  - Share market insights with Research Analyst\n"
-            "  - Coordinate with Productivity Assistant for automation\n"
-            "  - Maintain structured documentation for the team",
-        ],
+        tools=_finance_tools(),
+        description=_FINANCE_DESCRIPTION,
+        instructions=_FINANCE_INSTRUCTIONS,
         markdown=True,
-        show_tool_calls=True,
+        show_tool_calls=agent_settings.show_tool_calls,
     )
 
 def get_research_agent() -> Agent:
@@ -85,40 +322,11 @@ def get_research_agent() -> Agent:
         name="Research Analyst",
         agent_id="research-analyst",
         model=OpenAIChat(id=agent_settings.gpt_4),
-        tools=[
-            DuckDuckGo(),
-            Newspaper4k(),
-            ExaTools(start_published_date=datetime.now().strftime("%Y-%m-%d")),
-            PDFTools(),
-            WebScraper(),
-            DatetimeTools(),
-            TextTools(),    # For text analysis
-            ImageTools(),   # For image processing
-            XmlTools(),     # For structured data
-            CsvTools(),     # For data processing
-        ],
-        description="You are a senior research analyst specializing in market intelligence, trend analysis, and competitive research.",
-        instructions=[
-            "Research Protocol:\n"
-            "  - Conduct comprehensive web research\n"
-            "  - Analyze news articles and reports\n"
-            "  - Synthesize information from multiple sources\n"
-            "  - Track temporal trends and patterns\n"
-            "  - Monitor competitor activities",
-            
-            "Report Format:\n"
-            "  - Structure as NYT-style articles\n"
-            "  - Include executive summary\n"
-            "  - Provide detailed citations\n"
-            "  - Add timestamps for time-sensitive data",
-            
-            "Team Collaboration:\n"
-            "  - Share research findings with Finance Analyst\n"
-            "  - Coordinate with Productivity Assistant for report automation\n"
-            "  - Maintain research database for the team",
-        ],
+        tools=_research_tools(),
+        description=_RESEARCH_DESCRIPTION,
+        instructions=_RESEARCH_INSTRUCTIONS,
         markdown=True,
-        show_tool_calls=True,
+        show_tool_calls=agent_settings.show_tool_calls,
     )
 
 def get_productivity_agent() -> Agent:
@@ -126,45 +334,11 @@ def get_productivity_agent() -> Agent:
         name="Productivity Assistant",
         agent_id="productivity-assistant",
         model=OpenAIChat(id=agent_settings.gpt_4),
-        tools=[
-            PythonREPL(),
-            FileManager(),
-            Calculator(),
-            YouTubeTools(),
-            WebScraper(),
-            EmailTools(),
-            PDFTools(),
-            SQLTools(),
-            DatetimeTools(),
-        ],
-        description="You are a productivity expert specializing in task automation, workflow optimization, and information management.",
-        instructions=[
-            "Task Automation:\n"
-            "  - Write Python scripts for repetitive tasks\n"
-            "  - Process and analyze documents efficiently\n"
-            "  - Automate data collection and reporting\n"
-            "  - Create SQL queries for data analysis\n"
-            "  - Manage email communications",
-            
-            "Document Management:\n"
-            "  - Extract key information from documents\n"
-            "  - Organize and categorize content\n"
-            "  - Generate structured summaries\n"
-            "  - Maintain version control",
-            
-            "Information Processing:\n"
-            "  - Synthesize data from multiple sources\n"
-            "  - Create actionable insights\n"
-            "  - Maintain clear documentation\n"
-            "  - Schedule and track deadlines",
-            
-            "Team Collaboration:\n"
-            "  - Automate workflows for Finance and Research teams\n"
-            "  - Create templates and documentation\n"
-            "  - Maintain shared knowledge base",
-        ],
+        tools=_productivity_tools(),
+        description=_PRODUCTIVITY_DESCRIPTION,
+        instructions=_PRODUCTIVITY_INSTRUCTIONS,
         markdown=True,
-        show_tool_calls=True,
+        show_tool_calls=agent_settings.show_tool_calls,
     )
 
 def get_example_agent(
@@ -172,125 +346,152 @@ def get_example_agent(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
     debug_mode: bool = False,
+    team: Optional[List[Agent]] = None,
 ) -> Agent:
-    finance_agent = get_finance_agent()
-    research_agent = get_research_agent()
-    productivity_agent = get_productivity_agent()
-    
-    return Agent(
+    if team is None:
+        # Sub-agents are only built when the super agent first transfers a task to them.
+        # The placeholders carry the shared toolkits so the transfer prompt lists each member's tools.
+        team = [
+            LazyAgent(
+                name="Finance Analyst",
+                agent_id="finance-analyst",
+                role="Market research, financial analysis and quantitative modeling",
+                tools=_finance_tools(),
+                factory=get_finance_agent,
+            ),
+            LazyAgent(
+                name="Research Analyst",
+                agent_id="research-analyst",
+                role="Market intelligence, trend analysis and competitive research",
+                tools=_research_tools(),
+                factory=get_research_agent,
+            ),
+            LazyAgent(
+                name="Productivity Assistant",
+                agent_id="productivity-assistant",
+                role="Task automation, workflow optimization and information management",
+                tools=_productivity_tools(),
+                factory=get_productivity_agent,
+            ),
+        ]
+
+    return TeamLeaderAgent(
         name="AIGI3 Super Agent",
         agent_id="aigi3-super-agent",
         session_id=session_id,
         user_id=user_id,
-        model=OpenAIChat(
+        model=CachedOpenAIChat(
             id=model_id or agent_settings.gpt_4,
             max_tokens=agent_settings.default_max_completion_tokens,
             temperature=agent_settings.default_temperature,
+            cache=example_agent_response_cache,
+            similarity_threshold=agent_settings.response_cache_similarity,
+            ttl_seconds=agent_settings.response_cache_ttl,
+            user_id=user_id,
+            # Let the model request independent tools in one turn, they are run concurrently
+            tool_choice="auto",
+            request_params={"parallel_tool_calls": True},
         ),
-        team=[finance_agent, research_agent, productivity_agent],
-        tools=[
-            DuckDuckGo(),
-            WebScraper(),
-            Calculator(),
-            PythonREPL(),
-            FileManager(),
-            YFinanceTools(enable_all=True),
-            YouTubeTools(),
-            PDFTools(),
-            EmailTools(),
-            SQLTools(),
-            DatetimeTools(),
-        ],
-        description="""You are AIGI3, an advanced AI agent team coordinator specializing in finance, research, and productivity.
-        You orchestrate a team of specialized agents and have access to comprehensive market data, research tools, and automation capabilities.
-        Your role is to ensure seamless collaboration between agents and deliver high-quality, integrated solutions.""",
-        instructions=[
-            "Team Coordination:\n"
-            "  - Analyze requests and delegate tasks to appropriate specialized agents\n"
-            "  - Ensure effective communication between agents\n"
-            "  - Synthesize insights from multiple agents into cohesive outputs\n"
-            "  - Monitor and maintain quality standards across all deliverables",
-            
-            "Financial Analysis:\n"
-            "  - Coordinate Finance Analyst's market research with Research Analyst's findings\n"
-            "  - Ensure comprehensive coverage of both technical and fundamental analysis\n"
-            "  - Validate financial data accuracy across team outputs",
-            
-            "Research Integration:\n"
-            "  - Combine market intelligence with financial analysis\n"
-            "  - Ensure cross-validation of sources and findings\n"
-            "  - Maintain consistent research standards across the team",
-            
-            "Knowledge Management:\n"
-            "  - Coordinate knowledge sharing between agents\n"
-            "  - Ensure proper documentation of all analyses and findings\n"
-            "  - Maintain version control of shared resources",
-            
-            "Productivity Enhancement:\n"
-            "  - Identify opportunities for workflow automation\n"
-            "  - Streamline collaboration between agents\n"
-            "  - Optimize resource utilization across the team",
-            
-            "Quality Control:\n"
-            "  - Review and validate all agent outputs\n"
-            "  - Ensure consistency in formatting and presentation\n"
-            "  - Maintain audit trails for all team activities",
-        ],
+        team=team,
+        tools=_sorted_tools([
+            _duckduckgo,
+            _web_scraper,
+            _calculator,
+            _python,
+            _file_manager,
+            _yfinance,
+            _youtube,
+            _pdf,
+            _email,
+            _sql,
+            _datetime,
+            _output_pager,
+        ]),
+        description=_SUPER_AGENT_DESCRIPTION,
+        instructions=_SUPER_AGENT_INSTRUCTIONS,
         markdown=True,
-        show_tool_calls=True,
+        show_tool_calls=agent_settings.show_tool_calls,
         add_datetime_to_instructions=True,
         storage=example_agent_storage,
-        read_chat_history=True,
+        # Send the last 10 turns verbatim, older turns are folded into the session summary
+        memory=SummarizingMemory(
+            window=10,
+            summarizer=MemorySummarizer(
+                model=OpenAIChat(id=agent_settings.gpt_4_mini, max_tokens=500),
+            ),
+        ),
+        add_history_to_messages=True,
+        num_history_responses=10,
         knowledge=example_agent_knowledge,
         search_knowledge=True,
         monitoring=True,
         debug_mode=debug_mode,
-        monitoring_config={
-            "metrics": {
-                "custom_metrics": {
-                    "team_coordination_latency": {
-                        "type": "Histogram",
-                        "description": "Time taken for team coordination tasks",
-                        "buckets": [0.1, 0.5, 1.0, 2.0, 5.0]
-                    },
-                    "agent_memory_usage": {
-                        "type": "Gauge",
-                        "description": "Memory usage per agent"
-                    },
-                    "knowledge_base_hits": {
-                        "type": "Counter",
-                        "description": "Knowledge base access patterns"
-                    }
-                }
-            },
-            "tracing": {
-                "enabled": True,
-                "sample_rate": 1.0
-            }
-        },
-        coordination_patterns={
-            "consensus": {
-                "min_agreements": 2,
-                "timeout": 30
-            },
-            "fallback": {
-                "retry_count": 3,
-                "backup_agent": "productivity-agent"
-            }
-        },
-        streaming=True,
-        stream_tokens=True,
-        stream_template="{agent_name}: {message}",
-        conversation_memory=True,
-        memory_window=10,
-        error_handling={
-            "ui_friendly_errors": True,
-            "retry_on_failure": True,
-            "max_retries": 3,
-            "error_messages": {
-                "rate_limit": "Please wait a moment before sending another message.",
-                "token_limit": "The message is too long. Please try a shorter message.",
-                "api_error": "There was a temporary issue. Please try again."
-            }
-        }
+        monitoring_config=_MONITORING_CONFIG,
+        coordination_patterns=_COORDINATION_PATTERNS,
+        error_handling=_ERROR_HANDLING,
+    )
+
+
+async def get_example_agent_async(
+    model_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    debug_mode: bool = False,
+) -> Agent:
+    """Build the super agent with all sub-agents constructed up front, concurrently.
+
+    Use this instead of get_example_agent when the first delegation should not pay for building
+    a sub-agent, e.g. when warming up a server.
+    """
+    finance_agent, research_agent, productivity_agent = await asyncio.gather(
+        asyncio.to_thread(get_finance_agent),
+        asyncio.to_thread(get_research_agent),
+        asyncio.to_thread(get_productivity_agent),
+    )
+    return get_example_agent(
+        model_id=model_id,
+        user_id=user_id,
+        session_id=session_id,
+        debug_mode=debug_mode,
+        team=[finance_agent, research_agent, productivity_agent],
+    )
+
+
+async def run_batch_async(
+    prompts: List[str],
+    model_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    concurrency: int = 4,
+    debug_mode: bool = False,
+) -> List[RunResponse]:
+    """Run the super agent on many prompts, e.g. for evals and backtests.
+
+    Identical prompts are sent once and their response is reused for every occurrence.
+    Each unique prompt runs in its own agent (and session), at most `concurrency` at a time,
+    because an Agent keeps per-run state and cannot serve overlapping runs.
+    Responses are returned in the same order as `prompts`.
+    """
+    unique_prompts = list(dict.fromkeys(prompts))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_prompt(prompt: str) -> RunResponse:
+        async with semaphore:
+            agent = get_example_agent(model_id=model_id, user_id=user_id, debug_mode=debug_mode)
+            return await agent.arun(prompt, stream=False)
+
+    unique_responses = await asyncio.gather(*(run_prompt(prompt) for prompt in unique_prompts))
+    responses = dict(zip(unique_prompts, unique_responses))
+    return [responses[prompt] for prompt in prompts]
+
+
+def run_batch(
+    prompts: List[str],
+    model_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    concurrency: int = 4,
+    debug_mode: bool = False,
+) -> List[RunResponse]:
+    """Blocking wrapper around run_batch_async"""
+    return asyncio.run(
+        run_batch_async(prompts, model_id=model_id, user_id=user_id, concurrency=concurrency, debug_mode=debug_mode)
     )
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from phi.memory.agent import AgentMemory
+from phi.memory.summarizer import MemorySummarizer
+from phi.memory.summary import SessionSummary
+from phi.model.message import Message
+
+
+class SummarizingMemory(AgentMemory):
+    """AgentMemory that keeps the last `window` chats verbatim and folds older chats into the summary.
+
+    phi summarizes the whole session after every run and stores every chat, so both the summarizer
+    prompt and the stored session grow with each turn. Here only chats that fall out of the window
+    are summarized, merged into the previous summary, and then dropped, so the summary, the chats
+    stored in the session and the history sent to the model all stay bounded.
+    `messages` is left untouched so the full conversation can still be displayed.
+    """
+
+    window: int = 10
+    create_session_summary: bool = True
+
+    def update_summary(self) -> Optional[SessionSummary]:
+        if len(self.chats) <= self.window:
+            return self.summary
+
+        self.updating_memory = True
+        try:
+            aged_out_chats = self.chats[: -self.window]
+            message_pairs = AgentMemory(chats=aged_out_chats).get_message_pairs()
+            # Carry the previous summary forward instead of re-summarizing chats it already covers
+            if self.summary is not None:
+                message_pairs.insert(
+                    0,
+                    (
+                        Message(role="user", content="Summarize our conversation so far."),
+                        Message(role="assistant", content=self.summary.model_dump_json()),
+                    ),
+                )
+
+            if self.summarizer is None:
+                self.summarizer = MemorySummarizer()
+            summary = self.summarizer.run(message_pairs)
+            # Only drop the aged-out chats once they are covered by a summary, otherwise retry next run
+            if summary is not None:
+                self.summary = summary
+                self.chats = self.chats[len(aged_out_chats) :]
+        finally:
+            self.updating_memory = False
+        return self.summary
@@ -0,0 +1,146 @@
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Set
+
+from phi.model.message import Message
+from phi.model.openai import OpenAIChat
+from phi.model.response import ModelResponse, ModelResponseEvent
+from phi.tools import Toolkit
+from phi.tools.function import FunctionCall
+from phi.utils.timer import Timer
+
+from agents.settings import agent_settings
+from utils.log import build_json_logger
+
+tool_logger = build_json_logger("aigi3.tools", logging.getLevelName(agent_settings.tool_log_level.upper()))
+
+
+class ParallelToolOpenAIChat(OpenAIChat):
+    """OpenAIChat that executes the tool calls of a single model turn concurrently.
+
+    With `parallel_tool_calls` enabled the model can request several independent tools in one
+    turn (e.g. a web search and a stock quote). phi runs them one after another, so this class
+    runs the calls to toolkits in `parallel_safe_toolkits` on a thread pool of at most
+    `max_parallel_tool_calls` workers instead. Transfers to team members and toolkits that keep
+    state still run one at a time, alongside the pool.
+    Results are still added to the messages in the order the model requested them.
+    Completed tool calls are logged as JSON to the `aigi3.tools` logger at DEBUG level.
+    """
+
+    max_parallel_tool_calls: int = 8
+    # Names of toolkits whose functions can run concurrently with each other
+    parallel_safe_toolkits: Set[str] = {
+        "calculator",
+        "duckduckgo",
+        "newspaper_tools",
+        "output_pager",
+        "yfinance_tools",
+    }
+
+    def _is_parallel_safe(self, function_call: FunctionCall) -> bool:
+        # Toolkit functions are bound methods, possibly wrapped by OutputPagerTools.
+        # Transfer functions are closures over a member agent and have no toolkit.
+        entrypoint = function_call.function.entrypoint
+        toolkit = getattr(inspect.unwrap(entrypoint), "__self__", None) if entrypoint is not None else None
+        return isinstance(toolkit, Toolkit) and toolkit.name in self.parallel_safe_toolkits
+
+    def _run_function_call(self, function_call: FunctionCall, tool_role: str) -> Message:
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        function_call_success = function_call.execute()
+        _function_call_timer.stop()
+        return Message(
+            role=tool_role,
+            content=function_call.result if function_call_success else function_call.error,
+            tool_call_id=function_call.call_id,
+            tool_name=function_call.function.name,
+            tool_args=function_call.arguments,
+            tool_call_error=not function_call_success,
+            metrics={"time": _function_call_timer.elapsed},
+        )
+
+    def run_function_calls(
+        self, function_calls: List[FunctionCall], function_call_results: List[Message], tool_role: str = "tool"
+    ) -> Iterator[ModelResponse]:
+        for model_response in self._run_function_calls(function_calls, function_call_results, tool_role):
+            # Skip building the log record entirely unless tool call logging is enabled
+            if (
+                model_response.event == ModelResponseEvent.tool_call_completed.value
+                and tool_logger.isEnabledFor(logging.DEBUG)
+                and model_response.tool_call is not None
+            ):
+                tool_logger.debug(
+                    "tool_call",
+                    extra={
+                        "tool_name": model_response.tool_call.get("tool_name"),
+                        "tool_args": model_response.tool_call.get("tool_args"),
+                        "tool_call_error": model_response.tool_call.get("tool_call_error"),
+                        "time": (model_response.tool_call.get("metrics") or {}).get("time"),
+                    },
+                )
+            yield model_response
+
+    def _run_function_calls(
+        self, function_calls: List[FunctionCall], function_call_results: List[Message], tool_role: str
+    ) -> Iterator[ModelResponse]:
+        if len(function_calls) < 2:
+            yield from super().run_function_calls(
+                function_calls=function_calls, function_call_results=function_call_results, tool_role=tool_role
+            )
+            return
+
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
+        for function_call in function_calls:
+            yield ModelResponse(
+                content=function_call.get_call_str(),
+                tool_call={
+                    "role": tool_role,
+                    "tool_call_id": function_call.call_id,
+                    "tool_name": function_call.function.name,
+                    "tool_args": function_call.arguments,
+                },
+                event=ModelResponseEvent.tool_call_started.value,
+            )
+
+        # -*- Run function calls
+        # Every call the model requested is run, each tool_call_id needs a tool message in the next request
+        parallel = [i for i, fc in enumerate(function_calls) if self._is_parallel_safe(fc)]
+        max_workers = max(min(len(parallel), self.max_parallel_tool_calls), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(self._run_function_call, function_calls[i], tool_role) for i in parallel}
+            sequential = {
+                i: self._run_function_call(function_call, tool_role)
+                for i, function_call in enumerate(function_calls)
+                if i not in futures
+            }
+            results = [futures[i].result() if i in futures else sequential[i] for i in range(len(function_calls))]
+
+        for function_call, _function_call_result in zip(function_calls, results):
+            elapsed = _function_call_result.metrics["time"]
+            yield ModelResponse(
+                content=f"{function_call.get_call_str()} completed in {elapsed:.4f}s.",
+                tool_call=_function_call_result.model_dump(
+                    include={
+                        "content",
+                        "tool_call_id",
+                        "tool_name",
+                        "tool_args",
+                        "tool_call_error",
+                        "metrics",
+                        "created_at",
+                    }
+                ),
+                event=ModelResponseEvent.tool_call_completed.value,
+            )
+
+            # Add metrics to the model
+            self.metrics.setdefault("tool_call_times", {}).setdefault(function_call.function.name, []).append(elapsed)
+
+            function_call_results.append(_function_call_result)
+            self.function_call_stack.append(function_call)
+
+        if self.tool_call_limit and len(self.function_call_stack) >= self.tool_call_limit:
+            self.deactivate_function_calls()
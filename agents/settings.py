@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -8,9 +9,20 @@ class AgentSettings(BaseSettings):
     """
 
     gpt_4: str = "gpt-4o"
+    gpt_4_mini: str = "gpt-4o-mini"
     embedding_model: str = "text-embedding-3-small"
     default_max_completion_tokens: int = 16000
     default_temperature: float = 0
+    # Expected number of vectors in the knowledge base, used to size the HNSW index
+    knowledge_vector_count: int = 100_000
+    # Minimum cosine similarity for a prompt to be answered from the response cache
+    response_cache_similarity: float = 0.92
+    # Seconds a cached response is served before the model is asked again
+    response_cache_ttl: int = 3600
+    # Render tool calls into agent responses, off by default so servers don't format them on every call
+    show_tool_calls: bool = Field(False, validation_alias="AIGI3_SHOW_TOOL_CALLS")
+    # Level of the JSON tool call logger, tool calls are logged at DEBUG
+    tool_log_level: str = Field("INFO", validation_alias="AIGI3_TOOL_LOG_LEVEL")
 
 
 # Create an AgentSettings object
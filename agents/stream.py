@@ -0,0 +1,26 @@
+from typing import Iterator
+
+from phi.agent import RunResponse
+
+
+def coalesce_stream(stream: Iterator[RunResponse], chunk_size: int = 64) -> Iterator[str]:
+    """Re-chunk a token stream into pieces of at least `chunk_size` characters.
+
+    Callers that redraw the whole response on every delta (e.g. a Streamlit container) do far less
+    work per response when they receive a few larger chunks instead of one event per token.
+    Whatever is buffered when the stream finishes is always yielded.
+    """
+    buffer = []
+    buffered_chars = 0
+    for delta in stream:
+        if not delta.content:
+            continue
+        content = str(delta.content)
+        buffer.append(content)
+        buffered_chars += len(content)
+        if buffered_chars >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered_chars = 0
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,74 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import PrivateAttr
+from phi.agent import Agent
+from phi.model.message import Message
+from phi.tools.function import Function
+
+from utils.dttm import current_minute_str
+
+
+class LazyAgent(Agent):
+    """Team member that builds the underlying Agent on first delegation.
+
+    Only the fields the team leader needs to describe the member (name, agent_id, role and the
+    tools listed in its transfer prompt) are set up front. The member itself, with its model, is
+    created by `factory` the first time a task is transferred to it, so agents that are never
+    delegated to cost little to construct. Pass the same toolkit instances the factory uses.
+    """
+
+    factory: Callable[[], Agent]
+
+    _agent: Optional[Agent] = PrivateAttr(default=None)
+
+    @property
+    def agent(self) -> Agent:
+        if self._agent is None:
+            self._agent = self.factory()
+        return self._agent
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        # The leader sets session_data on this placeholder before each transfer
+        self.agent.session_data = self.session_data
+        return self.agent.run(*args, **kwargs)
+
+    async def arun(self, *args: Any, **kwargs: Any) -> Any:
+        self.agent.session_data = self.session_data
+        return await self.agent.arun(*args, **kwargs)
+
+
+class TeamLeaderAgent(Agent):
+    """Agent that coordinates a team and keeps its system prompt cacheable.
+
+    phi adds `datetime.now()` to the middle of the system message when
+    `add_datetime_to_instructions` is set, so the prompt prefix changes on every run and the
+    provider's prompt cache never hits. Here the time is rounded down to the minute and added
+    at the end of the system message instead. Callers relying on the time in the prompt should
+    expect minute precision.
+
+    phi also rebuilds a transfer function for every team member on every run. They only depend
+    on the member, so they are built once per member and reused, keyed by `agent_id`.
+    """
+
+    _transfer_functions: Dict[str, Tuple[Agent, Function]] = PrivateAttr(default_factory=dict)
+
+    def get_transfer_function(self, member_agent: Agent, index: int) -> Function:
+        key = member_agent.agent_id or f"agent_{index}"
+        cached = self._transfer_functions.get(key)
+        # Rebuild if a different agent has been put in the team under the same key
+        if cached is None or cached[0] is not member_agent:
+            cached = (member_agent, super().get_transfer_function(member_agent, index))
+            self._transfer_functions[key] = cached
+        return cached[1]
+
+    def get_system_message(self) -> Optional[Message]:
+        add_datetime_to_instructions = self.add_datetime_to_instructions
+        self.add_datetime_to_instructions = False
+        try:
+            system_message = super().get_system_message()
+        finally:
+            self.add_datetime_to_instructions = add_datetime_to_instructions
+
+        if add_datetime_to_instructions and system_message is not None and isinstance(system_message.content, str):
+            system_message.content += f"\n\nThe current time is {current_minute_str()}"
+        return system_message
@@ -0,0 +1,231 @@
+import io
+import os
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from functools import wraps
+from hashlib import md5
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from threading import Condition, Lock
+from typing import Any, Callable, Iterator, List, Optional
+
+from phi.tools import Toolkit
+from phi.utils.log import logger
+
+# Imported once in every worker so code run by the agent doesn't pay for them on each call
+_PRELOADED_MODULES = ("math", "json", "datetime", "statistics", "numpy", "pandas")
+
+
+def _warm_up_worker() -> None:
+    import importlib
+
+    for module_name in _PRELOADED_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+
+def _run_code(code: str, variable_to_return: Optional[str]) -> str:
+    """Runs `code` in a fresh namespace in a worker and returns its output"""
+    namespace: dict = {"__name__": "__main__"}
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        exec(code, namespace)
+    if variable_to_return:
+        if variable_to_return not in namespace:
+            return f"Variable {variable_to_return} not found"
+        return str(namespace[variable_to_return])
+    return stdout.getvalue() or "successfully ran python code"
+
+
+def _worker_main(conn: Connection) -> None:
+    _warm_up_worker()
+    while True:
+        try:
+            code, variable_to_return = conn.recv()
+        except EOFError:
+            return
+        # Tell the caller the snippet is starting, so its timeout doesn't include the warm-up
+        conn.send(None)
+        try:
+            conn.send(_run_code(code, variable_to_return))
+        except Exception as e:
+            conn.send(f"Error running python code: {e}")
+
+
+class _Worker:
+    """A pre-warmed process that runs one snippet at a time"""
+
+    def __init__(self) -> None:
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PooledPythonTools(Toolkit):
+    """Runs Python code in a pool of pre-warmed worker processes.
+
+    Each call runs in a fresh namespace in a separate process, so agent code can neither block the
+    caller's event loop nor corrupt its state, and common modules are already imported.
+    The workers are shared by every instance and started on first use. A call has a worker to
+    itself, and its timeout only starts once the snippet is running. When a call times out only
+    its worker is killed, a new one is started in its place on a later call.
+    """
+
+    _idle_workers: List[_Worker] = []
+    _busy_workers: int = 0
+    _workers_changed = Condition()
+
+    def __init__(self, timeout: float = 60, max_workers: Optional[int] = None):
+        super().__init__(name="python_tools")
+
+        self.timeout: float = timeout
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.register(self.run_python_code, sanitize_arguments=False)
+
+    def acquire_worker(self) -> _Worker:
+        """Returns an idle worker, starting one if fewer than `max_workers` are running"""
+        cls = PooledPythonTools
+        with cls._workers_changed:
+            while len(cls._idle_workers) == 0 and cls._busy_workers >= self.max_workers:
+                cls._workers_changed.wait()
+            cls._busy_workers += 1
+            worker = cls._idle_workers.pop() if len(cls._idle_workers) > 0 else None
+        if worker is not None and worker.process.is_alive():
+            return worker
+        try:
+            return _Worker()
+        except Exception:
+            self.release_worker(None)
+            raise
+
+    @staticmethod
+    def release_worker(worker: Optional[_Worker]) -> None:
+        """Returns `worker` to the pool, pass None after killing it to free its slot"""
+        cls = PooledPythonTools
+        with cls._workers_changed:
+            cls._busy_workers -= 1
+            if worker is not None:
+                cls._idle_workers.append(worker)
+            cls._workers_changed.notify()
+
+    def run_python_code(self, code: str, variable_to_return: Optional[str] = None) -> str:
+        """This function runs Python code and returns what it printed.
+        If successful, returns the value of `variable_to_return` if provided otherwise returns the printed output.
+        If failed, returns an error message.
+
+        :param code: The code to run.
+        :param variable_to_return: The variable to return.
+        :return: value of `variable_to_return` if provided, otherwise the printed output.
+        """
+        logger.debug(f"Running code:\n\n{code}\n\n")
+        worker: Optional[_Worker]
+        try:
+            worker = self.acquire_worker()
+        except Exception as e:
+            logger.error(f"Error running python code: {e}")
+            return f"Error running python code: {e}"
+        try:
+            worker.conn.send((code, variable_to_return))
+            worker.conn.recv()
+            if not worker.conn.poll(self.timeout):
+                logger.error(f"Python code did not finish within {self.timeout}s")
+                worker.kill()
+                worker = None
+                return f"Error running python code: timed out after {self.timeout}s"
+            return worker.conn.recv()
+        except Exception as e:
+            # The worker died or its result could not be sent back, don't reuse it
+            logger.error(f"Error running python code: {e}")
+            if worker is not None:
+                worker.kill()
+                worker = None
+            return f"Error running python code: {e}"
+        finally:
+            self.release_worker(worker)
+
+
+def iter_chunks(text: str, chunk_size: int) -> Iterator[str]:
+    """Yields `text` in chunks of at most `chunk_size` characters, preferring to split at a newline"""
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        yield text[start:end]
+        start = end
+
+
+class OutputPagerTools(Toolkit):
+    """Pages long tool outputs instead of sending them to the model in one piece.
+
+    Toolkits passed to `wrap` return only the first page of any output longer than `page_size`
+    characters. The remaining pages are kept in a small LRU and the model reads them on demand
+    with `read_output_page`, so a 300 page PDF or a long scraped page costs a few thousand tokens
+    per turn instead of the whole document.
+    """
+
+    def __init__(self, page_size: int = 8000, max_outputs: int = 32):
+        super().__init__(name="output_pager")
+
+        self.page_size: int = page_size
+        self.max_outputs: int = max_outputs
+        self._outputs: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = Lock()
+        self.register(self.read_output_page)
+
+    def wrap(self, toolkit: Toolkit) -> Toolkit:
+        for function in toolkit.functions.values():
+            if function.entrypoint is not None:
+                function.entrypoint = self._paged(function.entrypoint)
+        return toolkit
+
+    def _paged(self, entrypoint: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(entrypoint)
+        def paged_entrypoint(*args: Any, **kwargs: Any) -> Any:
+            output = entrypoint(*args, **kwargs)
+            if not isinstance(output, str) or len(output) <= self.page_size:
+                return output
+            return self._first_page(output)
+
+        return paged_entrypoint
+
+    def _first_page(self, output: str) -> str:
+        pages = list(iter_chunks(output, self.page_size))
+        output_id = md5(output.encode()).hexdigest()[:12]
+        with self._lock:
+            self._outputs[output_id] = pages
+            self._outputs.move_to_end(output_id)
+            while len(self._outputs) > self.max_outputs:
+                self._outputs.popitem(last=False)
+        return self._format_page(output_id, pages, 1)
+
+    def _format_page(self, output_id: str, pages: List[str], page: int) -> str:
+        footer = f"\n\n[Page {page} of {len(pages)} of output {output_id}."
+        if page < len(pages):
+            footer += f" Call read_output_page with output_id={output_id} and page={page + 1} for more."
+        return pages[page - 1] + footer + "]"
+
+    def read_output_page(self, output_id: str, page: int) -> str:
+        """Use this function to read the next page of a tool output that was too long to return at once.
+
+        :param output_id: The output id shown at the end of the previous page.
+        :param page: The page number to read, starting at 1.
+        :return: The requested page of the output.
+        """
+        with self._lock:
+            pages = self._outputs.get(output_id)
+        if pages is None:
+            return f"Output {output_id} is no longer available, run the tool again"
+        if page < 1 or page > len(pages):
+            return f"Output {output_id} has {len(pages)} pages"
+        return self._format_page(output_id, pages, page)
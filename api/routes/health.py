@@ -1,5 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import text
 
+from db.session import db_engine
 from utils.dttm import current_utc_str
 
 ######################################################
@@ -9,9 +11,13 @@ from utils.dttm import current_utc_str
 health_check_router = APIRouter(tags=["Health"])
 
 
+# Set once the database has answered, after that the Api stays ready
+_ready: bool = False
+
+
 @health_check_router.get("/health")
 def get_health():
-    """Check the health of the Api"""
+    """Check the health (liveness) of the Api, without touching the database. See /ready for that"""
 
     return {
         "status": "success",
@@ -19,3 +25,24 @@ def get_health():
         "path": "/health",
         "utc": current_utc_str(),
     }
+
+
+@health_check_router.get("/ready")
+def get_ready():
+    """Check the readiness of the Api: 200 once the database has accepted a connection, 503 until then"""
+
+    global _ready
+    if not _ready:
+        try:
+            with db_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Database not ready: {e}")
+        _ready = True
+
+    return {
+        "status": "success",
+        "router": "health",
+        "path": "/ready",
+        "utc": current_utc_str(),
+    }
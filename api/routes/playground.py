@@ -7,7 +7,7 @@ from agents.example import get_example_agent
 ## Router for the agent playground
 ######################################################
 
-example_agent = get_example_agent(debug_mode=True)
+example_agent = get_example_agent(debug_mode=getenv("RUNTIME_ENV") == "dev")
 
 # Create a playground instance
 playground = Playground(agents=[example_agent])
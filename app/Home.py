@@ -22,6 +22,7 @@ from phi.tools.streamlit.components import (
 from phi.utils.log import logger
 
 from agents.example import get_example_agent
+from agents.stream import coalesce_stream
 
 nest_asyncio.apply()
 st.set_page_config(
@@ -170,10 +171,10 @@ def main() -> None:
             with st.spinner("Thinking..."):
                 resp_container = st.empty()
                 response = ""
-                for delta in example_agent.run(
-                    message=question, images=[uploaded_image] if uploaded_image else [], stream=True
+                for chunk in coalesce_stream(
+                    example_agent.run(message=question, images=[uploaded_image] if uploaded_image else [], stream=True)
                 ):
-                    response += delta.content  # type: ignore
+                    response += chunk
                     resp_container.markdown(response)
             st.session_state["messages"].append({"role": "assistant", "content": response})
 
@@ -0,0 +1,58 @@
+"""Store knowledge embeddings as halfvec
+
+Revision ID: 3f9c2a1d7b4e
+Revises:
+Create Date: 2026-10-15 10:12:31.482913
+
+"""
+from alembic import op
+
+from agents.knowledge import configure_hnsw_params
+from agents.settings import agent_settings
+
+
+# revision identifiers, used by Alembic.
+revision = "3f9c2a1d7b4e"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Same parameters the knowledge base is configured with in agents/example.py
+_hnsw = configure_hnsw_params(agent_settings.knowledge_vector_count)
+
+
+def upgrade() -> None:
+    # The table is created by PgVector, so only convert it when it already exists
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF to_regclass('ai.example_agent_knowledge') IS NOT NULL THEN
+                DROP INDEX IF EXISTS ai.example_agent_knowledge_hnsw_index;
+                ALTER TABLE ai.example_agent_knowledge
+                    ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536);
+                CREATE INDEX example_agent_knowledge_hnsw_index ON ai.example_agent_knowledge
+                    USING hnsw (embedding halfvec_cosine_ops)
+                    WITH (m = {_hnsw.m}, ef_construction = {_hnsw.ef_construction});
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF to_regclass('ai.example_agent_knowledge') IS NOT NULL THEN
+                DROP INDEX IF EXISTS ai.example_agent_knowledge_hnsw_index;
+                ALTER TABLE ai.example_agent_knowledge
+                    ALTER COLUMN embedding TYPE vector(1536) USING embedding::vector(1536);
+                CREATE INDEX example_agent_knowledge_hnsw_index ON ai.example_agent_knowledge
+                    USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = {_hnsw.m}, ef_construction = {_hnsw.ef_construction});
+            END IF;
+        END $$;
+        """
+    )
@@ -19,6 +19,9 @@ class DbSettings(BaseSettings):
     db_pass: Optional[str] = None
     db_database: Optional[str] = None
     db_driver: str = "postgresql+psycopg"
+    # Connection pool shared by the API, agent storage and vector dbs
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
     # Create/Upgrade database on startup using alembic
     migrate_db: bool = False
 
@@ -1,18 +1,18 @@
-﻿#!/bin/bash
+#!/bin/bash
 set -e
 
-# Wait for services if enabled
-if [ "$WAIT_FOR_DB" = "true" ]; then
+# Wait for services if enabled, the WAIT_FOR_* flags are "1" or "0"
+if [ "${WAIT_FOR_DB:-0}" = "1" ]; then
     echo "Waiting for database..."
     dockerize -wait tcp://${DB_HOST}:${DB_PORT} -timeout 60s
 fi
 
-if [ "$WAIT_FOR_REDIS" = "true" ]; then
+if [ "${WAIT_FOR_REDIS:-0}" = "1" ]; then
     echo "Waiting for Redis..."
     dockerize -wait tcp://${REDIS_HOST}:${REDIS_PORT} -timeout 60s
 fi
 
-if [ "$WAIT_FOR_QDRANT" = "true" ]; then
+if [ "${WAIT_FOR_QDRANT:-0}" = "1" ]; then
     echo "Waiting for Qdrant..."
     dockerize -wait tcp://${QDRANT_HOST}:${QDRANT_PORT} -timeout 60s
 fi
@@ -0,0 +1,88 @@
+from time import time
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.model.message import Message
+from phi.vectordb.base import VectorDb
+
+from agents.cache import CachedOpenAIChat, MemoEmbedder, cosine_similarity
+
+
+class CountingEmbedder(Embedder):
+    calls: int = 0
+
+    def get_embedding(self, text: str) -> List[float]:
+        self.calls += 1
+        return [1.0, 0.0]
+
+
+def cached_model(**kwargs) -> CachedOpenAIChat:
+    return CachedOpenAIChat(id="gpt-4o", cache=MagicMock(spec=VectorDb), **kwargs)
+
+
+def conversation(*contents: str) -> List[Message]:
+    roles = ["user", "assistant"]
+    return [Message(role=roles[i % 2], content=content) for i, content in enumerate(contents)]
+
+
+def test_cosine_similarity():
+    assert cosine_similarity([1.0, 0.0], [1.0, 0.0]) == pytest.approx(1.0)
+    assert cosine_similarity([1.0, 0.0], [0.0, 1.0]) == pytest.approx(0.0)
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+
+
+def test_cache_key_needs_cache_and_owner():
+    messages = conversation("What is the capital of France?")
+
+    assert CachedOpenAIChat(id="gpt-4o").get_cache_key(messages) is None
+    assert cached_model().get_cache_key(messages) is None
+    assert cached_model(user_id="u1").get_cache_key(messages) is not None
+
+
+def test_short_follow_ups_are_not_cached():
+    model = cached_model(user_id="u1")
+
+    assert model.get_cache_key(conversation("Tell me about Paris", "Paris is...", "continue")) is None
+
+
+def test_cache_key_is_scoped_by_user_and_history():
+    prompt = "What is the capital of France?"
+    key = cached_model(user_id="u1").get_cache_key(conversation(prompt))
+
+    assert key.prompt == prompt
+    assert key == cached_model(user_id="u1").get_cache_key(conversation(prompt))
+    assert key.scope != cached_model(user_id="u2").get_cache_key(conversation(prompt)).scope
+    assert key.scope != cached_model(user_id="u1").get_cache_key(conversation("Hi", "Hello", prompt)).scope
+
+
+def test_expired_entries_are_not_served():
+    model = cached_model(user_id="u1", ttl_seconds=60)
+    key = model.get_cache_key(conversation("What is the capital of France?"))
+    document = Document(content=key.prompt, embedder=CountingEmbedder(), embedding=[1.0, 0.0])
+
+    document.meta_data = {"response": "Paris", "created_at": time()}
+    model.cache.search.return_value = [document]
+    assert model.get_cached_response(key) == "Paris"
+
+    document.meta_data = {"response": "Paris", "created_at": time() - 120}
+    assert model.get_cached_response(key) is None
+
+
+def test_answers_that_used_tools_are_not_cached():
+    messages = conversation("What is the capital of France?")
+
+    assert CachedOpenAIChat._used_tools(messages + [Message(role="tool", content="Paris")], len(messages))
+    assert not CachedOpenAIChat._used_tools(messages + [Message(role="assistant", content="Paris")], len(messages))
+
+
+def test_memo_embedder_embeds_each_text_once():
+    embedder = CountingEmbedder()
+    memo = MemoEmbedder(embedder=embedder)
+
+    memo.get_embedding("prompt")
+    memo.get_embedding_and_usage("prompt")
+
+    assert embedder.calls == 1
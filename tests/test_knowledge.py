@@ -0,0 +1,13 @@
+import pytest
+
+from agents.knowledge import configure_hnsw_params
+
+
+@pytest.mark.parametrize("vector_count", [1_000, 50_000, 500_000, 5_000_000])
+def test_hnsw_params_grow_with_corpus(vector_count):
+    small = configure_hnsw_params(1_000)
+    params = configure_hnsw_params(vector_count)
+
+    assert params.m >= small.m
+    assert params.ef_construction >= small.ef_construction
+    assert params.ef_search >= small.ef_search
@@ -0,0 +1,69 @@
+from typing import Optional
+
+import pytest
+from phi.agent import RunResponse
+from phi.memory.agent import AgentChat
+from phi.memory.summarizer import MemorySummarizer
+from phi.memory.summary import SessionSummary
+from phi.model.message import Message
+
+from agents.memory import SummarizingMemory
+
+
+class FakeSummarizer(MemorySummarizer):
+    summary: Optional[SessionSummary] = None
+    fail: bool = False
+    calls: int = 0
+
+    def run(self, message_pairs, **kwargs) -> Optional[SessionSummary]:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("summarizer unavailable")
+        return self.summary
+
+
+def chat(index: int) -> AgentChat:
+    messages = [Message(role="user", content=f"question {index}"), Message(role="assistant", content=f"answer {index}")]
+    return AgentChat(response=RunResponse(messages=messages))
+
+
+def memory(num_chats: int, **summarizer_kwargs) -> SummarizingMemory:
+    return SummarizingMemory(
+        window=2,
+        chats=[chat(i) for i in range(num_chats)],
+        summarizer=FakeSummarizer(**summarizer_kwargs),
+    )
+
+
+def test_chats_inside_the_window_are_not_summarized():
+    agent_memory = memory(2, summary=SessionSummary(summary="unused"))
+
+    assert agent_memory.update_summary() is None
+    assert agent_memory.summarizer.calls == 0
+    assert len(agent_memory.chats) == 2
+
+
+def test_aged_out_chats_are_folded_into_the_summary():
+    summary = SessionSummary(summary="questions 0 to 2")
+    agent_memory = memory(5, summary=summary)
+
+    assert agent_memory.update_summary() == summary
+    assert [c.response.messages[0].content for c in agent_memory.chats] == ["question 3", "question 4"]
+    assert agent_memory.updating_memory is False
+
+
+def test_chats_are_kept_when_the_summarizer_returns_nothing():
+    agent_memory = memory(5)
+
+    assert agent_memory.update_summary() is None
+    assert len(agent_memory.chats) == 5
+
+
+def test_chats_are_kept_when_the_summarizer_fails():
+    agent_memory = memory(5, fail=True)
+
+    with pytest.raises(RuntimeError):
+        agent_memory.update_summary()
+
+    assert len(agent_memory.chats) == 5
+    assert agent_memory.updating_memory is False
@@ -0,0 +1,13 @@
+from phi.agent import RunResponse
+
+from agents.stream import coalesce_stream
+
+
+def test_coalesce_stream_joins_small_deltas():
+    stream = (RunResponse(content=token) for token in ["ab", "cd", "", "ef", "g"])
+
+    assert list(coalesce_stream(stream, chunk_size=4)) == ["abcd", "efg"]
+
+
+def test_coalesce_stream_skips_empty_stream():
+    assert list(coalesce_stream(iter([RunResponse(content=None)]))) == []
@@ -0,0 +1,49 @@
+from typing import Any, List
+
+from phi.agent import Agent
+from phi.tools import Toolkit
+
+from agents.team import LazyAgent
+
+
+class EchoAgent(Agent):
+    def run(self, message: Any = None, **kwargs: Any) -> Any:
+        return f"{self.name}: {message} ({self.session_data})"
+
+
+def get_quote(symbol: str) -> str:
+    """Get a stock quote"""
+    return symbol
+
+
+def lazy_member(built: List[Agent]) -> LazyAgent:
+    def factory() -> Agent:
+        built.append(EchoAgent(name="Member"))
+        return built[-1]
+
+    toolkit = Toolkit(name="quotes")
+    toolkit.register(get_quote)
+    return LazyAgent(name="Member", role="Looks up quotes", tools=[toolkit], factory=factory)
+
+
+def test_lazy_agent_builds_on_first_run_only():
+    built: List[Agent] = []
+    member = lazy_member(built)
+    assert built == []
+
+    member.session_data = {"leader_session_id": "s1"}
+    assert member.run("hello") == "Member: hello ({'leader_session_id': 's1'})"
+    member.run("again")
+
+    assert len(built) == 1
+
+
+def test_transfer_prompt_lists_member_tools():
+    built: List[Agent] = []
+    leader = Agent(name="Leader", team=[lazy_member(built)])
+
+    transfer_prompt = leader.get_transfer_prompt()
+
+    assert "Role: Looks up quotes" in transfer_prompt
+    assert "Available tools: get_quote" in transfer_prompt
+    assert built == []
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.tools import OutputPagerTools, PooledPythonTools, iter_chunks
+
+
+def test_iter_chunks_splits_at_newlines():
+    chunks = list(iter_chunks("line 1\nline 2\nline 3\n", 8))
+
+    assert "".join(chunks) == "line 1\nline 2\nline 3\n"
+    assert all(len(chunk) <= 8 for chunk in chunks)
+
+
+def test_output_pager_pages_long_outputs():
+    pager = OutputPagerTools(page_size=10)
+    first_page = pager._first_page("x" * 25)
+
+    assert first_page.startswith("x" * 10)
+    assert "Page 1 of 3" in first_page
+
+    output_id = first_page.split("of output ")[1].split(".")[0]
+    assert pager.read_output_page(output_id, 3).startswith("x" * 5)
+    assert "has 3 pages" in pager.read_output_page(output_id, 4)
+
+
+def test_output_pager_leaves_short_outputs_alone():
+    pager = OutputPagerTools(page_size=10)
+    paged = pager._paged(lambda: "short")
+
+    assert paged() == "short"
+
+
+def test_python_tools_recover_after_timeout():
+    tools = PooledPythonTools(timeout=1, max_workers=1)
+
+    assert "timed out" in tools.run_python_code("while True: pass")
+    assert tools.run_python_code("print(2)").strip() == "2"
+
+
+def test_python_tools_timeout_excludes_waiting_for_a_worker():
+    tools = PooledPythonTools(timeout=1, max_workers=1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        outputs = list(executor.map(tools.run_python_code, ["import time; time.sleep(0.7); print(1)"] * 2))
+
+    assert [output.strip() for output in outputs] == ["1", "1"]
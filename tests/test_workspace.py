@@ -0,0 +1,7 @@
+import importlib
+
+
+def test_dev_resources_import():
+    dev_resources = importlib.import_module("workspace.dev_resources")
+
+    assert dev_resources.dev_docker_resources is not None
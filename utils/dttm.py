@@ -1,3 +1,4 @@
+from functools import lru_cache
 from datetime import datetime, timezone
 
 
@@ -7,3 +8,13 @@ def current_utc() -> datetime:
 
 def current_utc_str(format: str = "%Y-%m-%dT%H:%M:%S.%fZ") -> str:
     return current_utc().strftime(format)
+
+
+@lru_cache(maxsize=60)
+def _format_minute(minute: datetime) -> str:
+    return minute.strftime("%Y-%m-%d %H:%M")
+
+
+def current_minute_str() -> str:
+    """Local time truncated to the minute, so the string only changes once a minute"""
+    return _format_minute(datetime.now().replace(second=0, microsecond=0))
@@ -1,4 +1,15 @@
+import atexit
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 def build_logger(
@@ -29,3 +40,139 @@ def build_logger(
 
 # Default logger instance
 logger: logging.Logger = build_logger("agent-app")
+
+
+def dumps_json(obj: Any) -> str:
+    """Serializes `obj` to a JSON string with orjson if it is installed, falling back to json.
+    Values that aren't JSON serializable are converted with str."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, including any `extra` fields"""
+
+    # Attributes every LogRecord has, everything else was passed using `extra`
+    _record_attrs = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        return dumps_json(self.to_dict(record))
+
+    def to_dict(self, record: logging.LogRecord) -> Dict[str, Any]:
+        log_entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        log_entry.update({k: v for k, v in vars(record).items() if k not in self._record_attrs})
+        if record.exc_info:
+            log_entry["exc_info"] = self.formatException(record.exc_info)
+        return log_entry
+
+
+def build_json_logger(logger_name: str, log_level: int = logging.INFO) -> logging.Logger:
+    json_handler = logging.StreamHandler()
+    json_handler.setFormatter(JsonFormatter())
+
+    _logger = logging.getLogger(logger_name)
+    _logger.addHandler(json_handler)
+    _logger.setLevel(log_level)
+    _logger.propagate = False
+    return _logger
+
+
+class ElasticsearchBulkHandler(logging.Handler):
+    """Buffers log records and writes them to Elasticsearch with the `_bulk` API.
+
+    Records are sent in batches of up to `chunk_size` documents, at the latest every
+    `flush_interval` seconds, instead of one HTTP request per record.
+    Use `build_elasticsearch_handler` so records are also handed off through a queue.
+    """
+
+    def __init__(
+        self,
+        hosts: List[str],
+        index: str,
+        flush_interval: float = 30,
+        chunk_size: int = 500,
+        max_chunk_bytes: int = 5 * 1024 * 1024,
+    ):
+        super().__init__()
+        from elasticsearch import Elasticsearch
+
+        self.client = Elasticsearch(hosts)
+        self.index: str = index
+        self.flush_interval: float = flush_interval
+        self.chunk_size: int = chunk_size
+        self.max_chunk_bytes: int = max_chunk_bytes
+        self.json_formatter = JsonFormatter()
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = Lock()
+        self._closed = Event()
+        self._flusher = Thread(target=self._flush_periodically, name="elasticsearch-log-flusher", daemon=True)
+        self._flusher.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            source = {
+                k: v if isinstance(v, (str, int, float, bool, type(None), list, dict)) else str(v)
+                for k, v in self.json_formatter.to_dict(record).items()
+            }
+            document = {"_index": self.index, "_source": source}
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            self._buffer.append(document)
+            full = len(self._buffer) >= self.chunk_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._buffer_lock:
+            actions, self._buffer = self._buffer, []
+        if not actions:
+            return
+        from elasticsearch.helpers import streaming_bulk
+
+        try:
+            for ok, item in streaming_bulk(
+                self.client,
+                actions,
+                chunk_size=self.chunk_size,
+                max_chunk_bytes=self.max_chunk_bytes,
+                raise_on_error=False,
+            ):
+                if not ok:
+                    logger.warning(f"Failed to index log record: {item}")
+        except Exception as e:
+            logger.warning(f"Failed to send {len(actions)} log records to Elasticsearch: {e}")
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        super().close()
+
+
+def build_elasticsearch_handler(
+    hosts: List[str], index: str, flush_interval: float = 30, chunk_size: int = 500
+) -> QueueHandler:
+    """Handler that queues records for an ElasticsearchBulkHandler running on a listener thread,
+    so logging calls never wait on the network."""
+    log_queue: "Queue[logging.LogRecord]" = Queue(-1)
+    bulk_handler = ElasticsearchBulkHandler(hosts, index, flush_interval=flush_interval, chunk_size=chunk_size)
+    listener = QueueListener(log_queue, bulk_handler, respect_handler_level=True)
+    listener.start()
+
+    def _stop() -> None:
+        listener.stop()
+        bulk_handler.close()
+
+    atexit.register(_stop)
+    return QueueHandler(log_queue)
@@ -1,4 +1,7 @@
+from functools import lru_cache
 from os import getenv
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 from phi.docker.app.fastapi import FastApi
 from phi.docker.app.postgres import PgVectorDb
@@ -6,19 +9,34 @@ from phi.docker.app.streamlit import Streamlit
 from phi.docker.resource.image import DockerImage
 from phi.docker.resources import DockerResources
 from phi.docker.app.redis import Redis
-from phi.docker.app.qdrant import QdrantDb
+from phi.docker.app.qdrant import Qdrant
+from phi.utils.yaml_io import read_yaml_file
 
-from workspace.settings import ws_settings
+from workspace.settings import env_flag, ws_settings
 
 #
 # -*- Resources for the Development Environment
 #
 
+
+def container_healthcheck(test: List[str], interval_seconds: int = 15) -> Dict[str, Any]:
+    """Docker HEALTHCHECK for a dev container. Docker emits a health_status event whenever the result changes,
+    which scripts/setup_dev_env.py waits on after restarting a service."""
+    return {
+        "test": test,
+        "interval": interval_seconds * 1_000_000_000,
+        "timeout": 5 * 1_000_000_000,
+        "retries": 3,
+        "start_period": 10 * 1_000_000_000,
+    }
+
+
 # -*- Dev image
 dev_image = DockerImage(
     name=f"{ws_settings.image_repo}/{ws_settings.image_name}",
     tag=ws_settings.dev_env,
-    enabled=ws_settings.build_images,
+    # Only build the image when an app that runs it is enabled
+    enabled=ws_settings.build_images and (ws_settings.dev_app_enabled or ws_settings.dev_api_enabled),
     path=str(ws_settings.ws_root),
     push_image=False,
 )
@@ -26,68 +44,108 @@ dev_image = DockerImage(
 # -*- Redis for caching and session management
 dev_redis = Redis(
     name=f"{ws_settings.ws_name}-redis",
+    group="db",
     enabled=True,
     host_port=6379,
-    environment={
-        "REDIS_PASSWORD": "ai_redis_password",  # Set a secure password
-    },
+    # Dev cache only: keep everything in memory and skip RDB/AOF writes
+    create_volume=False,
+    # phi joins the command with spaces and docker shlex-splits it, so the empty --save value that
+    # disables RDB snapshots has to be quoted to survive as its own argument
+    command=[
+        "redis-server",
+        "--save ''",
+        "--appendonly",
+        "no",
+        "--maxmemory",
+        "512mb",
+        "--maxmemory-policy",
+        "allkeys-lru",
+        "--requirepass",
+        "ai_redis_password",
+    ],
+    container_healthcheck=container_healthcheck(
+        ["CMD-SHELL", "redis-cli -a ai_redis_password ping | grep -q PONG"]
+    ),
 )
 
 # -*- Qdrant for vector search
-dev_qdrant = QdrantDb(
+dev_qdrant = Qdrant(
     name=f"{ws_settings.ws_name}-qdrant",
+    group="db",
     enabled=True,
     host_port=6333,
+    # The qdrant image has no HTTP client, so only check that the REST port accepts connections
+    container_healthcheck=container_healthcheck(["CMD-SHELL", "bash -c ':> /dev/tcp/127.0.0.1/6333'"]),
 )
 
 # -*- Dev database running on port 5433
 dev_db = PgVectorDb(
     name=f"{ws_settings.ws_name}-db",
+    group="db",
     enabled=ws_settings.dev_db_enabled,
     pg_user="ai",
     pg_password="ai",
     pg_database="ai",
     host_port=5433,
+    container_healthcheck=container_healthcheck(["CMD-SHELL", "pg_isready -U ai -d ai"]),
 )
 
 # -*- Build container environment
-container_env = {
-    "RUNTIME_ENV": "dev",
-    "OPENAI_API_KEY": getenv("OPENAI_API_KEY"),
-    "PHI_MONITORING": "True",
-    "PHI_API_KEY": getenv("PHI_API_KEY"),
-    # Database configuration
-    "DB_HOST": dev_db.get_db_host(),
-    "DB_PORT": dev_db.get_db_port(),
-    "DB_USER": dev_db.get_db_user(),
-    "DB_PASS": dev_db.get_db_password(),
-    "DB_DATABASE": dev_db.get_db_database(),
-    # Redis configuration
-    "REDIS_HOST": dev_redis.get_host(),
-    "REDIS_PORT": dev_redis.get_port(),
-    "REDIS_PASSWORD": "ai_redis_password",
-    # Qdrant configuration
-    "QDRANT_HOST": dev_qdrant.get_host(),
-    "QDRANT_PORT": dev_qdrant.get_port(),
-    # Wait for services
-    "WAIT_FOR_DB": ws_settings.dev_db_enabled,
-    "WAIT_FOR_REDIS": True,
-    "WAIT_FOR_QDRANT": True,
-    "MAX_MEMORY": "2G",
-    "MAX_CPU": "1.5",
-    "GRACEFUL_SHUTDOWN_TIMEOUT": "30",
-    "HEALTH_CHECK_INTERVAL": "15",
-    # Add these for UI functionality
-    "STREAMLIT_SHARE_ENABLED": "true",
-    "STREAMLIT_CHAT_HISTORY": "true",
-    "STREAMLIT_MAX_MESSAGE_SIZE": "5242880",  # 5MB
-    "STREAMLIT_RATE_LIMIT": "100",
-    "STREAMLIT_SESSION_TIMEOUT": "3600",
-}
+@lru_cache(maxsize=None)
+def build_container_env() -> Mapping[str, Any]:
+    """Environment shared by the dev app containers, built once per process.
+    Read-only so the cached value can't be changed by one app and leak into the other."""
+    env = {
+        "RUNTIME_ENV": "dev",
+        "OPENAI_API_KEY": getenv("OPENAI_API_KEY"),
+        "PHI_MONITORING": "True",
+        "PHI_API_KEY": getenv("PHI_API_KEY"),
+        # Database configuration
+        "DB_HOST": dev_db.get_db_host(),
+        "DB_PORT": dev_db.get_db_port(),
+        "DB_USER": dev_db.get_db_user(),
+        "DB_PASS": dev_db.get_db_password(),
+        "DB_DATABASE": dev_db.get_db_database(),
+        # Redis configuration
+        "REDIS_HOST": dev_redis.get_db_host(),
+        "REDIS_PORT": dev_redis.get_db_port(),
+        "REDIS_PASSWORD": "ai_redis_password",
+        # Qdrant configuration
+        # phi's Qdrant app has no db getters, containers on the workspace network reach it by container name
+        "QDRANT_HOST": dev_qdrant.get_container_name(),
+        "QDRANT_PORT": dev_qdrant.container_port,
+        # Wait for services
+        "WAIT_FOR_DB": env_flag(ws_settings.dev_db_enabled),
+        "WAIT_FOR_REDIS": env_flag(True),
+        "WAIT_FOR_QDRANT": env_flag(True),
+        "GRACEFUL_SHUTDOWN_TIMEOUT": "30",
+        "HEALTH_CHECK_INTERVAL": "15",
+        # Add these for UI functionality
+        "STREAMLIT_SHARE_ENABLED": "true",
+        "STREAMLIT_CHAT_HISTORY": "true",
+        "STREAMLIT_MAX_MESSAGE_SIZE": "5242880",  # 5MB
+        "STREAMLIT_RATE_LIMIT": "100",
+        "STREAMLIT_SESSION_TIMEOUT": "3600",
+    }
+    return MappingProxyType(env)
+
+
+container_env = build_container_env()
+
+# -*- Secrets shared by the dev apps
+dev_app_secrets_file = ws_settings.ws_root.joinpath("workspace/secrets/dev_app_secrets.yml")
+
+
+@lru_cache(maxsize=None)
+def load_dev_app_secrets() -> Optional[Dict[str, Any]]:
+    """Parse dev_app_secrets.yml once, phi would otherwise read it separately for every app that uses it"""
+    return read_yaml_file(file_path=dev_app_secrets_file)
+
 
 # -*- Streamlit app
 dev_streamlit = Streamlit(
     name=f"{ws_settings.ws_name}-app",
+    group="app",
     enabled=ws_settings.dev_app_enabled,
     image=dev_image,
     command="streamlit run app/Home.py",
@@ -95,36 +153,51 @@ dev_streamlit = Streamlit(
     debug_mode=True,
     mount_workspace=True,
     streamlit_server_headless=True,
-    env_vars=container_env,
-    use_cache=ws_settings.use_cache,
-    secrets_file=ws_settings.ws_root.joinpath("workspace/secrets/dev_app_secrets.yml"),
-    depends_on=[dev_db, dev_redis, dev_qdrant],
-    environment={
+    # phi sends env_vars to the container, Streamlit's own settings are layered on top
+    env_vars={
         **container_env,
         "STREAMLIT_THEME_BASE": "light",
         "STREAMLIT_SERVER_MAX_UPLOAD_SIZE": "50",
         "STREAMLIT_CLIENT_TOOLBAR_MODE": "minimal",
-        "STREAMLIT_CLIENT_SHOW_ERROR_DETAILS": str(ws_settings.debug_mode).lower(),
+        # The dev app runs with debug_mode=True
+        "STREAMLIT_CLIENT_SHOW_ERROR_DETAILS": "true",
         "STREAMLIT_BROWSER_GATHER_USAGE_STATS": "false",
+        # inotify events through watchdog rather than polling the mounted workspace
+        "STREAMLIT_SERVER_FILE_WATCHER_TYPE": "watchdog",
     },
+    use_cache=ws_settings.use_cache,
+    secrets_file=dev_app_secrets_file,
+    cached_secret_file_data=load_dev_app_secrets(),
+    depends_on=[dev_db, dev_redis, dev_qdrant],
     health_check_endpoint="/health",
-    mount_workspace=True,
-    reload_on_change=True,
+    container_healthcheck=container_healthcheck(
+        ["CMD", "wget", "-q", "--spider", "http://localhost:8501/_stcore/health"]
+    ),
 )
 
 # -*- FastAPI app
 dev_fastapi = FastApi(
     name=f"{ws_settings.ws_name}-api",
+    group="api",
     enabled=ws_settings.dev_api_enabled,
     image=dev_image,
-    command="uvicorn api.main:app --reload",
+    # Only watch the packages the api imports, uvicorn uses watchfiles (inotify) for these
+    command=(
+        "uvicorn api.main:app --reload "
+        "--reload-dir api --reload-dir agents --reload-dir db --reload-dir utils"
+    ),
     port_number=8000,
     debug_mode=True,
     mount_workspace=True,
-    env_vars=container_env,
+    env_vars=dict(container_env),
     use_cache=ws_settings.use_cache,
-    secrets_file=ws_settings.ws_root.joinpath("workspace/secrets/dev_app_secrets.yml"),
+    secrets_file=dev_app_secrets_file,
+    cached_secret_file_data=load_dev_app_secrets(),
     depends_on=[dev_db, dev_redis, dev_qdrant],
+    # Liveness only: a restart can't fix the api while a dependency is down, /v1/ready reports that instead
+    container_healthcheck=container_healthcheck(
+        ["CMD", "wget", "-q", "--spider", "http://localhost:8000/v1/health"]
+    ),
 )
 
 # -*- Dev DockerResources
@@ -133,9 +206,3 @@ dev_docker_resources = DockerResources(
     network=ws_settings.ws_name,
     apps=[dev_db, dev_redis, dev_qdrant, dev_streamlit, dev_fastapi],
 )
-
-# Vector store configuration
-dev_vector_stores = {
-    "pgvector": dev_db,
-    "qdrant": dev_qdrant,
-}
@@ -12,7 +12,7 @@ from phi.aws.resource.secret import SecretsManager
 from phi.docker.resources import DockerResources
 from phi.docker.resource.image import DockerImage
 
-from workspace.settings import ws_settings
+from workspace.settings import env_flag, ws_settings
 
 #
 # -*- Resources for the Production Environment
@@ -183,7 +183,7 @@ container_env = {
     "DB_PASS": AwsReference(prd_db.get_master_user_password),
     "DB_DATABASE": AwsReference(prd_db.get_db_name),
     # Wait for database to be available before starting the application
-    "WAIT_FOR_DB": ws_settings.prd_db_enabled,
+    "WAIT_FOR_DB": env_flag(ws_settings.prd_db_enabled),
     # Migrate database on startup using alembic
     # "MIGRATE_DB": ws_settings.prd_db_enabled,
 }
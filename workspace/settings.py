@@ -39,3 +39,8 @@ ws_settings = WorkspaceSettings(
     # Build images locally
     # build_images=True,
 )
+
+
+def env_flag(enabled: bool) -> str:
+    """Container env value for a boolean flag, read as "1"/"0" by scripts/entrypoint.sh"""
+    return "1" if enabled else "0"